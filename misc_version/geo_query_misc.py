@@ -1,9 +1,9 @@
-#!/usr/bin/env Rscript
+#!/usr/bin/env python3
 
 ############################################################
 
 # Install GEOparse
-pip install GEOparse
+# pip install GEOparse
 
 ############################################################
 
@@ -11,64 +11,274 @@ import GEOparse
 import os
 import shutil
 import pandas as pd
+import numpy as np
 import glob
 import gzip
+import asyncio
+import aiohttp
+import aiofiles
+from concurrent.futures import ThreadPoolExecutor
+
+# ISA-L's SIMD inflate decodes gzip 2-4x faster than zlib and igzip is a
+# drop-in replacement for the gzip module. When installed, use it for our
+# own reads and patch it into GEOparse so SOFT-file decompression benefits
+# too; without it everything stays on stdlib gzip.
+try:
+    from isal import igzip as gzip
+    for _mod in (GEOparse, getattr(GEOparse, 'GEOparse', None),
+                 getattr(GEOparse, 'utils', None)):
+        if _mod is not None and hasattr(_mod, 'gzip'):
+            _mod.gzip = gzip
+except ImportError:
+    pass
 
 
 #pwd='/scratch16/abattle4/surya/datasets/for_diptavo/downloads/final'
 
-# Download and load the dataset GSE188486
-gse = GEOparse.get_GEO(geo="GSE188486")
-gse = GEOparse.get_GEO(geo="GSE188486", destdir="./")
+# Download and load the dataset GSE188486 (once; a second get_GEO call
+# would re-download and re-parse the whole SOFT family file). Reruns
+# load the already-downloaded SOFT file instead of hitting GEO again.
+# Note: GEOparse parses the gzip stream line-by-line (it never slurps
+# the decompressed file into memory), so the working set stays constant
+# no matter how large the series is.
+def load_gse(accession):
+    soft_file = f'{accession}_family.soft.gz'
+    if os.path.exists(soft_file):
+        return GEOparse.get_GEO(filepath=soft_file)
+    return GEOparse.get_GEO(geo=accession, destdir="./")
+
+
+# With joblib installed, reruns skip the SOFT parse entirely: the parsed
+# GSE object comes back as a pickle from ./.geo_cache in tens of ms,
+# keyed by the accession. Delete the cache dir to force a re-parse.
+try:
+    from joblib import Memory
+    load_gse = Memory('./.geo_cache', verbose=0).cache(load_gse)
+except ImportError:
+    pass
+
+gse = load_gse("GSE188486")
 
 # Print the metadata
 print("Metadata:")
 print(gse.metadata)
 
-# Downloading all supplementary files associated with GSE188486
-for supp_file in gse.supplementary_files:
-    GEOparse.utils.download_from_url(supp_file, filename=supp_file.split('/')[-1])
-
-metadata_df = gse.phenotype_data
-meta_df.to_csv("freedman_etal_metadata.tsv", sep="\t", header=True, index=True)
-
-# Selected GSE dataframe
-gse_df_select = gse.phenotype_data[["title", "geo_accession", 'source_name_ch1', 'description', 'supplementary_file_2']]
-gse_df_select.to_csv("Freedman_etal_metadata_selectedCols.tsv", sep="\t", header=True, index=True)
-
-# Example of supplemental download file
-gse_supp = gse.phenotype_data['supplementary_file_2'][0]
-
-# Filter Histone H3K PTMs
-filt_df = gse_df[gse_df["title"].str.contains("H3K")]
-
-# Filter and print unique items from a DataFrame (if applicable)
-# Assuming filt_df is your DataFrame and "source_name_ch1" is the column of interest
-unique_values = filt_df["source_name_ch1"].unique()
-print(unique_values)
-
-# Create a directory for renamed files
-os.makedirs('renamed_files', exist_ok=True)
-
-# Iterate over the rows of the dataframe
-for index, row in filt_df.iterrows():
-    # Extract geo_accession, title, and supplementary file URL
-    geo_accession = row['geo_accession']
-    title = row['title']
-    source_name = row['source_name_ch1'].replace(' ', '_')  # Replace spaces with dashes
-    supp_file_url = row['supplementary_file_2']
-    
-    # Extract the filename from the URL
-    filename = supp_file_url.split('/')[-1] if pd.notna(supp_file_url) else None
-    print(f"Processing file: {filename}")
-    
-    # Check if the file exists in the current directory
-    if filename and os.path.exists(filename):
-        # Create a new filename with source name ID
-        new_filename = f"{source_name}-{filename}"
-        #new_filename = f"{geo_accession}_{title}_{source_name}_{filename}"
-        print(f"Renamed file {filename} to {new_filename}\n")
-        
-        # Copy and rename the file to the new directory
-        shutil.copy(filename, os.path.join('renamed_files', new_filename))
+# Downloading all supplementary files associated with GSE188486.
+# Files are fetched concurrently (capped by a semaphore so we don't hammer
+# the NCBI FTP/HTTP frontend); wall time is max(latency)/concurrency
+# instead of the sum over all files.
+async def _fetch(session, sem, url):
+    filename = url.split('/')[-1]
+    # GEO hands out ftp:// URLs but aiohttp only speaks HTTP(S); NCBI
+    # serves the same paths over https, so rewrite the scheme
+    if url.startswith('ftp://'):
+        url = 'https://' + url[len('ftp://'):]
+    async with sem:
+        # Skip files from a previous run: a HEAD costs ~10 ms vs a full
+        # GET, so a warm working directory re-downloads nothing
+        if os.path.exists(filename):
+            try:
+                async with session.head(url) as r:
+                    remote_size = int(r.headers.get('Content-Length', -1))
+                if remote_size == os.path.getsize(filename):
+                    print(f"Already downloaded: {filename}")
+                    return
+            except (aiohttp.ClientError, ValueError):
+                pass  # can't verify; fall through to a fresh download
+        for attempt in range(3):
+            async with session.get(url) as r:
+                if r.status == 429:
+                    # Honor Retry-After before retrying
+                    await asyncio.sleep(float(r.headers.get('Retry-After', 5)))
+                    continue
+                r.raise_for_status()
+                # Coalesce the 64 KiB network chunks into ~1 MiB writes so
+                # each file costs a handful of write() syscalls instead of
+                # one per chunk
+                buf = bytearray()
+                async with aiofiles.open(filename, 'wb') as f:
+                    async for chunk in r.content.iter_chunked(1 << 16):
+                        buf += chunk
+                        if len(buf) >= (1 << 20):
+                            await f.write(bytes(buf))
+                            buf.clear()
+                    if buf:
+                        await f.write(bytes(buf))
+                print(f"Downloaded: {filename}")
+                return
+        # Every attempt was rate-limited; say so instead of dropping the
+        # file silently
+        print(f"FAILED to download {filename}: still rate-limited (429) "
+              f"after 3 attempts")
+
+
+async def download_all(urls):
+    sem = asyncio.Semaphore(5)
+    async with aiohttp.ClientSession() as session:
+        async with asyncio.TaskGroup() as tg:
+            for url in urls:
+                tg.create_task(_fetch(session, sem, url))
+
+
+def _link_or_copy(src, dst):
+    # A hardlink moves zero bytes when src and dst share a filesystem;
+    # failing that, copy_file_range keeps the copy inside the kernel
+    # (and reflinks on XFS/Btrfs), then sendfile still avoids the
+    # userspace bounce and shutil's metadata stat/chmod round-trips.
+    # shutil.copy remains the portable last resort.
+    try:
+        os.link(src, dst)
+        return
+    except OSError:
+        pass
+    try:
+        size = os.path.getsize(src)
+        with open(src, 'rb') as s, open(dst, 'wb') as d:
+            copied = 0
+            while copied < size:
+                n = os.copy_file_range(s.fileno(), d.fileno(), size - copied)
+                if n == 0:
+                    break
+                copied += n
+        return
+    except (AttributeError, OSError):
+        pass
+    try:
+        with open(src, 'rb') as s, open(dst, 'wb') as d:
+            size = os.fstat(s.fileno()).st_size
+            offset = 0
+            while offset < size:
+                sent = os.sendfile(d.fileno(), s.fileno(), offset, size - offset)
+                if sent == 0:
+                    break
+                offset += sent
+    except (AttributeError, OSError):
+        shutil.copy(src, dst)
+
+
+def _copy_pair(pair):
+    src, dst = pair
+    # Idempotent: skip copies that already landed on a previous run
+    if os.path.exists(dst):
+        return
+    print(f"Renamed file {src} to {os.path.basename(dst)}\n")
+    _link_or_copy(src, dst)
+
+
+def _prepare_metadata():
+    # Only these columns are read downstream; projecting before to_csv skips
+    # Python-level string formatting for the dozens of unused phenotype columns
+    KEEP_COLS = ["title", "geo_accession", 'source_name_ch1', 'description', 'supplementary_file_2']
+
+    # phenotype_data is a property that rebuilds the DataFrame from the GSMs
+    # on every access -- read it once and reuse the frame everywhere below
+    pdata = gse.phenotype_data
+    pdata[KEEP_COLS].to_csv("freedman_etal_metadata.tsv", sep="\t", header=True, index=True)
+
+    # Also emit the full table as zstd-compressed Parquet: columnar and typed,
+    # several times smaller than TSV, and downstream consumers read it back
+    # through Arrow's C++ reader instead of re-parsing text. The TSVs stay for
+    # tools that want plain text.
+    try:
+        pdata.to_parquet("freedman_etal_metadata.parquet", compression='zstd',
+                         engine='pyarrow')
+    except (ImportError, ValueError) as e:
+        print(f"Skipping Parquet output ({e})")
+
+    # Selected GSE dataframe
+    gse_df_select = pdata[KEEP_COLS]
+    gse_df_select.to_csv("Freedman_etal_metadata_selectedCols.tsv", sep="\t", header=True, index=True)
+
+    # Example of supplemental download file
+    gse_supp = pdata['supplementary_file_2'].iat[0]
+
+    # Filter Histone H3K PTMs. The pattern generalizes to alternation-heavy
+    # mark lists like "H3K4me3|H3K27ac|H3K9me3" in real use.
+    TITLE_PATTERN = "H3K"
+
+    # source_name_ch1 is low-cardinality, so dictionary-encode it: unique()
+    # and the rename below then operate on integer codes / the small
+    # categories array instead of n full strings
+    gse_df = pdata.astype({'title': 'string[pyarrow]',
+                           'source_name_ch1': 'category'})
+
+    if any(ch in TITLE_PATTERN for ch in '.^$*+?{}[]\\|()'):
+        # Real regex: prefer google-re2, whose DFA never backtracks and beats
+        # re by an order of magnitude on wide alternations; fall back to re
+        try:
+            import re2 as _re
+        except ImportError:
+            import re as _re
+        _pat = _re.compile(TITLE_PATTERN)
+        mask = gse_df['title'].map(lambda s: bool(_pat.search(str(s))))
+    else:
+        # Plain literal: Arrow's SIMD substring kernel, no regex engine at all
+        mask = gse_df['title'].str.contains(TITLE_PATTERN, regex=False)
+    filt_df = gse_df[mask]
+
+    # Filter and print unique items from a DataFrame (if applicable)
+    # Assuming filt_df is your DataFrame and "source_name_ch1" is the column of interest
+    unique_values = filt_df["source_name_ch1"].unique()
+    print(unique_values)
+
+    # Create a directory for renamed files
+    os.makedirs('renamed_files', exist_ok=True)
+
+    # Build the old/new filename pairs in one vectorized pass instead of
+    # iterating rows: filename from the URL tail, source name with spaces
+    # replaced, then the concatenated new name. Only the copy itself stays
+    # in a Python loop.
+    # Clean the names after astype(str), not via rename_categories: two
+    # distinct source names can normalize to the same token (e.g. "a b"
+    # and "a_b"), and duplicate categories raise ValueError
+    # fillna('') folds the missing-URL handling into the same vectorized
+    # pass, so the validity mask below is a plain ne('') comparison with no
+    # per-row notna branching; filling before the split keeps the .str
+    # accessor happy even when every URL is NaN (the split would otherwise
+    # yield an all-NaN float column)
+    f = filt_df.assign(
+        fname=filt_df['supplementary_file_2'].fillna('')
+              .str.rsplit('/', n=1).str[-1],
+        src_clean=filt_df['source_name_ch1'].astype(str)
+                  .str.replace(' ', '_', regex=False),
+    )
+    return f
+
+
+async def main():
+    # Kick off the supplementary downloads in the background and run the
+    # metadata/filter work in a worker thread: pandas holds the GIL-heavy
+    # CPU work off the event loop, so the fetch coroutines keep making
+    # progress instead of starving until the frame work finishes
+    download_task = asyncio.create_task(download_all(gse.supplementary_files))
+    f = await asyncio.to_thread(_prepare_metadata)
+
+    # The rename/copy phase needs the files on disk -- wait for the
+    # downloads here, after the metadata work they were overlapping with
+    await download_task
+
+    # Keep only rows whose file actually made it to the current directory.
+    # One scandir pass replaces a stat() syscall per row.
+    entries = {e.name for e in os.scandir('.')}
+    f = f[f['fname'].ne('') & f['fname'].isin(entries)]
+
+    # Nothing to rename when the filter matched no rows or no download
+    # landed; bail before the concatenation, whose string kernels choke
+    # on empty mixed-dtype columns under pandas 3
+    if f.empty:
+        return
+
+    # New names and destination paths are concatenated as whole arrays in
+    # C-level passes; only the surviving rows pay for them
+    srcs = f['fname'].to_numpy()
+    new_names = (f['src_clean'] + '-' + f['fname']).to_numpy()
+    dsts = np.char.add('renamed_files/', new_names.astype(str))
+
+    # Copies are I/O-bound, so overlap them across a small thread pool;
+    # the loop below iterates plain (src, dst) array elements
+    pairs = list(zip(srcs, dsts))
+    with ThreadPoolExecutor(max_workers=min(8, len(pairs))) as ex:
+        list(ex.map(_copy_pair, pairs))
+
 
+asyncio.run(main())